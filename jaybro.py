@@ -1,18 +1,59 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import json
+import mmap
 import readline
 import argparse
+import functools
 import sys
+import threading
+from bisect import bisect_left, bisect_right
 from termcolor import colored
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
+def _ansi(color):
+    """Return the (start, reset) escapes colored() emits for color; both are '' when colour is off."""
+    start, _, reset = colored('\0', color).partition('\0')
+    return start, reset
+
+# Escapes for hot output loops, taken from termcolor once so NO_COLOR,
+# ANSI_COLORS_DISABLED and non-TTY output are honoured like colored() calls
+BLUE, RESET = _ansi('blue')
+CYAN, GREEN, YELLOW, RED = (_ansi(color)[0] for color in ('cyan', 'green', 'yellow', 'red'))
+# re.sub replacement that highlights a match in red inside blue output
+HIGHLIGHT_REPL = f'{RED}\\g<0>{RESET}{BLUE}'
+
+# Classifies a command line in a single fullmatch; alternatives are tried in order
+COMMAND_RE = re.compile(
+    r'(?P<keyword>%|/h|/ks|/kl|\?\??)'
+    r'|(?P<levels>\?(?:\.\?)+)'
+    r'|(?P<command>/[fFkp]) (?P<arg>.*)'
+    r'|(?P<prefix>.*)\?'
+    r'|.*'
+)
+
 class PathCompleter:
     def __init__(self, json_data):
         self.json_data = json_data
-        self.paths = list(extract_paths(json_data).keys())
+        # The full path index is built on first use or by start_indexing(). TAB
+        # completion never needs it: it lists the children of the node being completed.
+        self._paths_dict = None
+        self._paths = None
+        self._paths_lower = None
+        self._index_lock = threading.Lock()
+        self._children_cache = {}
+        self._value_index = None
+        self._top_level_paths = None
         self.current_completions = []
+        # Text of the last completion, so a repeated TAB reuses it
+        self._last_text = None
         self.commands = {
             '/f ': 'Case-insensitive filter paths by word',
             '/F ': 'Case-sensitive filter paths by word',
@@ -24,118 +65,315 @@ class PathCompleter:
         }
         
     def complete(self, text, state):
-        if state == 0:
+        if state == 0 and text != self._last_text:
+            self._last_text = text
             # Special commands completion
             if text.startswith('/'):
                 self.current_completions = []
                 for cmd, help_text in self.commands.items():
                     if cmd.startswith(text):
                         # Add help text in a different color
-                        self.current_completions.append(f"{cmd}\t{colored(help_text, 'yellow')}")
+                        self.current_completions.append(f"{cmd}\t{YELLOW}{help_text}{RESET}")
             else:
                 # Path completion
-                self.current_completions = [p for p in self.paths if p.startswith(text)]
-                
+                self.current_completions = self.child_completions(text)
+
         return self.current_completions[state] if state < len(self.current_completions) else None
 
+    def _ensure_index(self):
+        """Build the full path index on first use, waiting for a background build in progress."""
+        with self._index_lock:
+            if self._paths_dict is None:
+                self._paths_dict = extract_paths(self.json_data)
+                self._paths = sorted(self._paths_dict.keys())
+                self._paths_lower = [p.lower() for p in self._paths]
+
+    def start_indexing(self):
+        """Build the full path index on a daemon thread while the session waits for input."""
+        threading.Thread(target=self._ensure_index, daemon=True).start()
+
+    @property
+    def paths_dict(self):
+        self._ensure_index()
+        return self._paths_dict
+
+    @property
+    def paths(self):
+        self._ensure_index()
+        return self._paths
+
+    @property
+    def paths_lower(self):
+        self._ensure_index()
+        return self._paths_lower
+
+    @property
+    def top_level_paths(self):
+        """Paths listed by ? (depth 1), collected once without the full index."""
+        if self._top_level_paths is None:
+            self._top_level_paths = [path for path, _ in iter_paths_to_depth(self.json_data, 1)]
+        return self._top_level_paths
+
+    def child_completions(self, text):
+        """Complete text against the children of its parent node, caching each parent's sorted children."""
+        parent = _parent_path(text)
+        children = self._children_cache.get(parent)
+        if children is None:
+            try:
+                node = get_value_at_path(self.json_data, parent) if parent else self.json_data
+            except ValueError:
+                node = None
+            if isinstance(node, (dict, list)):
+                children = sorted(path for path, _ in _child_paths(node, parent))
+            else:
+                children = []
+            self._children_cache[parent] = children
+        lo, hi = _prefix_range(children, text)
+        return children[lo:hi]
+
+    def containing_dict(self, path):
+        """Return the nearest dict ancestor of path from the index, or None at the top level."""
+        parent = _parent_path(path)
+        while parent:
+            node = self.paths_dict.get(parent)
+            if isinstance(node, dict):
+                return node
+            parent = _parent_path(parent)
+        return None
+
+    def paths_with_prefix(self, prefix):
+        """Return the sorted paths that start with prefix."""
+        lo, hi = _prefix_range(self.paths, prefix)
+        return self.paths[lo:hi]
+
+    def _build_value_index(self):
+        """Join the string form of every leaf value into one NUL-separated blob."""
+        leaf_paths = []
+        leaf_values = []
+        for path, value in self.paths_dict.items():
+            if not isinstance(value, (dict, list)):
+                leaf_paths.append(path)
+                leaf_values.append(value)
+        value_strs = [str(v) for v in leaf_values]
+        offsets = []
+        pos = 0
+        for value_str in value_strs:
+            offsets.append(pos)
+            pos += len(value_str) + 1
+        return leaf_paths, leaf_values, value_strs, offsets, '\0'.join(value_strs)
+
+    def search_leaves(self, pattern):
+        """Yield (path, value, value_str) for every leaf whose string form matches pattern.
+
+        The regex engine scans the joined blob built on the first /k search and
+        resumes at the next leaf after each hit, so Python only runs per match.
+        """
+        if self._value_index is None:
+            self._value_index = self._build_value_index()
+        leaf_paths, leaf_values, value_strs, offsets, blob = self._value_index
+        match = pattern.search(blob)
+        while match:
+            i = bisect_right(offsets, match.start()) - 1
+            yield leaf_paths[i], leaf_values[i], value_strs[i]
+            if i + 1 == len(offsets):
+                break
+            match = pattern.search(blob, offsets[i + 1])
+
+# orjson rounds integers outside the 64-bit range to floats, so a run of 20+
+# digits (19 after a minus sign) sends the input to the stdlib parser instead
+_WIDE_INT_RE = re.compile(rb'-\d{19}|\d{20}')
+
+def parse_json(raw):
+    """Parse JSON from a bytes-like object, using orjson when it is installed.
+
+    Returns (value, use_orjson). Input orjson cannot represent exactly (NaN,
+    Infinity, integers outside 64 bits) is parsed with the stdlib json module,
+    and use_orjson is False when the value holds any of those, so it is also
+    serialized with the stdlib.
+    """
+    if orjson is None:
+        return json.loads(raw), False
+    if not _WIDE_INT_RE.search(raw):
+        try:
+            return orjson.loads(raw), True
+        except orjson.JSONDecodeError:
+            pass  # retry below; stdlib json also accepts NaN and Infinity
+    inexact = []
+
+    def parse_int(text):
+        number = int(text)
+        if not -2 ** 63 <= number < 2 ** 64:
+            inexact.append(number)
+        return number
+
+    def parse_constant(text):
+        inexact.append(text)
+        return float(text)
+
+    value = json.loads(bytes(raw), parse_int=parse_int, parse_constant=parse_constant)
+    return value, not inexact
+
+def pretty_json(value, use_orjson):
+    """Serialize a value as JSON indented by two spaces."""
+    if use_orjson:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+# pretty_json output for values of the browsed document, keyed by id(); the
+# document is kept alive and never mutated for the whole session
+_pretty_cache = {}
+
+def pretty_json_cached(value, use_orjson):
+    """pretty_json memoized by identity, for values that belong to the browsed document."""
+    key = id(value)
+    text = _pretty_cache.get(key)
+    if text is None:
+        text = _pretty_cache[key] = pretty_json(value, use_orjson)
+    return text
+
+def compact_json(value, use_orjson):
+    """Serialize a value as single-line JSON."""
+    if use_orjson:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
 def load_json(filename):
-    """Load a JSON file into a Python dictionary."""
-    with open(filename, 'r') as file:
-        return json.load(file)
+    """Load a JSON file into a Python dictionary; returns (value, use_orjson) like parse_json."""
+    with open(filename, 'rb') as file:
+        if orjson is None or os.fstat(file.fileno()).st_size == 0:
+            return parse_json(file.read())
+        # Let orjson parse straight from the page cache instead of a bytes copy
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return parse_json(view)
+
+def _prefix_range(sorted_paths, prefix):
+    """Return the (lo, hi) slice of sorted_paths that start with prefix."""
+    lo = bisect_left(sorted_paths, prefix)
+    hi = bisect_left(sorted_paths, prefix + '\U0010ffff', lo)
+    return lo, hi
+
+def _parent_path(path):
+    """Strip the last key or index from a path; top-level paths give ''."""
+    cut = max(path.rfind('.'), path.rfind('['))
+    return path[:cut] if cut > 0 else ''
+
+def _child_paths(node, current_path):
+    """Return (path, value) pairs for the direct children of a dict or list."""
+    if isinstance(node, dict):
+        return [(f'{current_path}.{key}' if current_path else key, value) for key, value in node.items()]
+    return [(f'{current_path}[{i}]', item) for i, item in enumerate(node)]
 
 def extract_paths(data, current_path='', results=None):
-    """Recursively extract all paths in the JSON data."""
+    """Recursively extract all paths in the JSON data, in document order."""
     if results is None:
         results = {}
     if isinstance(data, dict):
+        prefix = f'{current_path}.' if current_path else ''
         for key, value in data.items():
-            path = f'{current_path}.{key}' if current_path else key
+            path = prefix + key
             results[path] = value
-            extract_paths(value, path, results)
+            # Only containers recurse, so leaves cost no extra call
+            if isinstance(value, (dict, list)):
+                extract_paths(value, path, results)
     elif isinstance(data, list):
         for i, item in enumerate(data):
             path = f'{current_path}[{i}]'
             results[path] = item
-            extract_paths(item, path, results)
+            if isinstance(item, (dict, list)):
+                extract_paths(item, path, results)
     return results
 
+@functools.lru_cache(maxsize=4096)
+def _parse_path(path):
+    """Tokenize a path like 'a.b[0].c' into a tuple of keys and list indices."""
+    steps = []
+    for elem in path.strip().split('.'):
+        key, *indices = elem.split('[')
+        if key or not indices:
+            steps.append(key)
+        for index in indices:
+            steps.append(int(index.rstrip(']')))
+    return tuple(steps)
+
 def get_value_at_path(data, path):
     """Get value at the specified path in the JSON data."""
-    elements = path.strip().split('.')
     try:
         current_data = data
-        for elem in elements:
-            if '[' in elem and ']' in elem:
-                index = int(elem[elem.find('[') + 1:elem.find(']')])
-                elem = elem.split('[')[0]
-                current_data = current_data[elem][index]
-            else:
-                current_data = current_data[elem]
+        for step in _parse_path(path):
+            current_data = current_data[step]
         return current_data
     except (KeyError, IndexError, TypeError):
         return None
 
+def iter_paths_to_depth(data, max_depth, current_path='', depth=1):
+    """Yield (path, value) pairs in document order, descending no deeper than max_depth.
+
+    Depth counts dotted segments, so list items stay at their parent's depth.
+    """
+    if not isinstance(data, (dict, list)):
+        return
+    for path, value in _child_paths(data, current_path):
+        yield path, value
+        if isinstance(value, dict) and depth < max_depth:
+            yield from iter_paths_to_depth(value, max_depth, path, depth + 1)
+        elif isinstance(value, list):
+            yield from iter_paths_to_depth(value, max_depth, path, depth)
+
+def print_paths(paths):
+    """Print paths one per line in a single colored write."""
+    listing = "\n".join(paths)
+    if listing:
+        sys.stdout.write(f"{BLUE}{listing}{RESET}\n")
+
 def display_paths_at_depth(data, depth):
     """Display paths at a specific depth."""
-    paths = extract_paths(data)
-    for path, value in paths.items():
-        path_parts = path.split('.')
-        if len(path_parts) <= depth:
-            print(colored(f"{path}", "blue"))
+    print_paths(path for path, _ in iter_paths_to_depth(data, depth))
 
-def print_structure(data, path):
+def print_structure(data, path, use_orjson):
     """Print the content of the JSON structure at the specified path."""
     value = get_value_at_path(data, path)
     if value is not None:
-        print(colored(json.dumps(value, indent=4), "cyan"))
+        print(colored(pretty_json_cached(value, use_orjson), "cyan"))
     else:
         print(colored("Invalid path.", "red"))
 
-def search_values_in_json(data, term, file_name, session_ts):
-    """Search for a term in the JSON values and print matching paths and content."""
-    paths = extract_paths(data)
-    json_output = []
-    
-    for path, value in paths.items():
-        if term.lower() in str(value).lower():
-            current_tag = path.split('.')[-1]
-            value_str = str(value)
-            highlighted_value = value_str.replace(term.lower(), colored(term.lower(), 'red'))
-            result = f"Path: {path}\nTag: {current_tag}\nValue: {highlighted_value}\n"
-            print(colored(result, "blue"))
-            print(colored(json.dumps(get_value_at_path(data, path), indent=4), "cyan"))
-            
-            # For JSON output
-            json_output.append({
-                "path": path,
-                "tag": current_tag,
-                "value": get_value_at_path(data, path)
-            })
+def search_values_in_json(completer, term, file_name, session_ts, use_orjson):
+    """Search for a term in the JSON leaf values and print matching paths and content."""
+    json_lines = []
+    parts = []
+    pattern = re.compile(re.escape(term), re.IGNORECASE)
     
-    if json_output:
-        session_file = f"{file_name}_{session_ts}.json"
+    for path, value, value_str in completer.search_leaves(pattern):
+        current_tag = path.split('.')[-1]
+        highlighted_value = pattern.sub(HIGHLIGHT_REPL, value_str)
+        parts.append(f"{BLUE}Path: {path}\nTag: {current_tag}\nValue: {highlighted_value}\n{RESET}\n")
+        node = completer.containing_dict(path)
+        parts.append(f"{CYAN}{pretty_json_cached(value if node is None else node, use_orjson)}{RESET}\n")
         
-        if os.path.exists(session_file):
-            with open(session_file, "r") as f:
-                existing_data = json.load(f)
-        else:
-            existing_data = []
-        
-        existing_data.extend(json_output)
-        
-        with open(session_file, "w") as f:
-            json.dump(existing_data, f, indent=2)
+        # For JSON output
+        json_lines.append(compact_json({
+            "path": path,
+            "tag": current_tag,
+            "value": value
+        }, use_orjson) + "\n")
+    sys.stdout.write("".join(parts))
+    
+    if json_lines:
+        # Append-only JSON Lines, so each save only writes the new matches
+        with open(f"{file_name}_{session_ts}.jsonl", "a", encoding="utf-8") as f:
+            f.write("".join(json_lines))
 
-def list_saved_json(file_name, session_ts):
-    session_file = f"{file_name}_{session_ts}.json"
+def list_saved_json(file_name, session_ts, use_orjson):
+    session_file = f"{file_name}_{session_ts}.jsonl"
     try:
-        with open(session_file, "r") as f:
-            saved_data = json.load(f)
-            for entry in saved_data:
-                print(colored(f"Path: {entry['path']}", "blue"))
-                print(colored(f"Tag: {entry['tag']}", "green"))
-                print(colored(f"Value: {json.dumps(entry['value'], indent=2)}", "yellow"))
-                print()
+        parts = []
+        with open(session_file, "rb") as f:
+            for line in f:
+                entry, _ = parse_json(line)
+                parts.append(f"{BLUE}Path: {entry['path']}{RESET}\n")
+                parts.append(f"{GREEN}Tag: {entry['tag']}{RESET}\n")
+                parts.append(f"{YELLOW}Value: {pretty_json(entry['value'], use_orjson)}{RESET}\n\n")
+        sys.stdout.write("".join(parts))
     except FileNotFoundError:
         print(colored("No saved JSON data found for the current session.", "red"))
 
@@ -157,6 +395,8 @@ prefix?    : List nodes starting with the specified prefix.
 %          : Exit the program.
 
 Use TAB for autocompletion of paths and commands (with help text).
+Path completion lists the direct children of the node typed so far; type '.' or '['
+and press TAB again to go deeper. Keys that contain '.' cannot be completed past.
 """
     print(colored(help_message, "yellow"))
 
@@ -169,7 +409,7 @@ def setup_readline():
     else:  # Linux and others
         readline.parse_and_bind('tab: complete')
 
-def interactive_browse(json_data, file_name):
+def interactive_browse(json_data, file_name, use_orjson, background_index=False):
     """Main function to handle user interaction."""
     session_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -178,6 +418,8 @@ def interactive_browse(json_data, file_name):
     readline.set_completer(completer.complete)
     readline.set_completer_delims(' \t\n')
     setup_readline()
+    if background_index:
+        completer.start_indexing()
     
     print_help()  # Display help on first run
 
@@ -189,57 +431,56 @@ def interactive_browse(json_data, file_name):
             if '\t' in user_input:
                 user_input = user_input.split('\t')[0]
 
-            if user_input == "%":
+            match = COMMAND_RE.fullmatch(user_input)
+            keyword, levels, command, prefix = match.group('keyword', 'levels', 'command', 'prefix')
+
+            if keyword == "%":
                 print(colored("Exiting.", "yellow"))
                 break
-            elif user_input == "/h":
+            elif keyword == "/h":
                 print_help()
-            elif user_input == "?":
-                display_paths_at_depth(json_data, 1)
-            elif user_input == "??":
-                display_paths_at_depth(json_data, float('inf'))
-            elif user_input.count("?.") > 0:
-                depth = user_input.count("?.") + 1
-                display_paths_at_depth(json_data, depth)
-            elif user_input.endswith("?"):
-                prefix = user_input[:-1]
-                paths = extract_paths(json_data)
-                matching_paths = {path for path in paths.keys() if path.startswith(prefix)}
-                if not matching_paths:
-                    print(colored("No matching results.", "red"))
-                else:
-                    for path in matching_paths:
-                        print(colored(f"{path}", "blue"))
-            elif user_input.startswith("/f "):
-                word = user_input[3:].strip().lower()
-                paths = extract_paths(json_data)
-                matching_paths = {path for path in paths.keys() if word in path.lower()}
-                for path in matching_paths:
-                    highlighted_path = path.replace(word.lower(), colored(word.lower(), 'red'))
-                    print(colored(f"{highlighted_path}", "blue"))
-            elif user_input.startswith("/F "):
-                word = user_input[3:].strip()
-                paths = extract_paths(json_data)
-                matching_paths = {path for path in paths.keys() if word in path}
-                for path in matching_paths:
-                    highlighted_path = path.replace(word, colored(word, 'red'))
-                    print(colored(f"{highlighted_path}", "blue"))
-            elif user_input.startswith("/k "):
-                term = user_input[3:].strip()
-                search_values_in_json(json_data, term, file_name, session_ts)
-            elif user_input == "/ks":
+            elif keyword == "?":
+                print_paths(completer.top_level_paths)
+            elif keyword == "??":
+                print_paths(completer.paths_dict)
+            elif keyword == "/ks":
                 # Save the results of the previous /k search
                 pass
-            elif user_input == "/kl":
-                list_saved_json(file_name, session_ts)
-            elif user_input.startswith("/p "):
+            elif keyword == "/kl":
+                list_saved_json(file_name, session_ts, use_orjson)
+            elif levels:
+                depth = levels.count(".") + 1
+                display_paths_at_depth(json_data, depth)
+            elif command == "/f":
+                word = match.group('arg').strip().lower()
+                matching_paths = [path for path_lower, path in zip(completer.paths_lower, completer.paths)
+                                  if word in path_lower]
+                pattern = re.compile(re.escape(word), re.IGNORECASE)
+                sys.stdout.write("".join(f"{BLUE}{pattern.sub(HIGHLIGHT_REPL, path)}{RESET}\n"
+                                         for path in matching_paths))
+            elif command == "/F":
+                word = match.group('arg').strip()
+                matching_paths = [path for path in completer.paths if word in path]
+                highlighted_word = f"{RED}{word}{RESET}{BLUE}"
+                sys.stdout.write("".join(f"{BLUE}{path.replace(word, highlighted_word)}{RESET}\n"
+                                         for path in matching_paths))
+            elif command == "/k":
+                term = match.group('arg').strip()
+                search_values_in_json(completer, term, file_name, session_ts, use_orjson)
+            elif command == "/p":
                 try:
-                    path_to_print = user_input[3:].strip()
-                    print_structure(json_data, path_to_print)
+                    path_to_print = match.group('arg').strip()
+                    print_structure(json_data, path_to_print, use_orjson)
                 except ValueError:
                     print(colored("Invalid input. Please enter a valid path.", "red"))
+            elif prefix is not None:
+                matching_paths = completer.paths_with_prefix(prefix)
+                if not matching_paths:
+                    print(colored("No matching results.", "red"))
+                else:
+                    sys.stdout.write("".join(f"{BLUE}{path}{RESET}\n" for path in matching_paths))
             else:
-                print_structure(json_data, user_input)
+                print_structure(json_data, user_input, use_orjson)
 
         except EOFError:
             print(colored("\nEOF detected. Exiting.", "yellow"))
@@ -251,22 +492,25 @@ def interactive_browse(json_data, file_name):
 def main():
     parser = argparse.ArgumentParser(description="Interactive JSON browser.")
     parser.add_argument("json_file", nargs="?", help="Path to the JSON file to browse")
+    parser.add_argument("--background-index", action="store_true",
+                        help="Build the full path index in a background thread at startup, "
+                             "so the first search on a large file does not wait for it")
     args = parser.parse_args()
 
     try:
         # Check if there's input from pipe
         if not sys.stdin.isatty():
             # Read from stdin for piped input
-            json_data = json.load(sys.stdin)
+            json_data, use_orjson = parse_json(sys.stdin.buffer.read())
             file_name = "stdin"
         elif args.json_file and os.path.exists(args.json_file):
-            json_data = load_json(args.json_file)
+            json_data, use_orjson = load_json(args.json_file)
             file_name = os.path.splitext(args.json_file)[0]
         else:
             print(colored("Error: No JSON file provided or piped input detected.", "red"))
             return
 
-        interactive_browse(json_data, file_name)
+        interactive_browse(json_data, file_name, use_orjson, args.background_index)
     except json.JSONDecodeError:
         print(colored("Error: Invalid JSON data provided.", "red"))
     except Exception as e: